@@ -1,55 +1,141 @@
 from flask import Flask, render_template, Response, request, redirect, url_for, jsonify
 import cv2
 import threading
+import logging
+import time
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from azure.core.pipeline.transport import RequestsTransport
 from azure.storage.blob import BlobServiceClient
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    turbo_jpeg = TurboJPEG()
+    TURBOJPEG_AVAILABLE = True
+except (ImportError, RuntimeError, OSError):
+    TURBOJPEG_AVAILABLE = False
+    logger.warning("TurboJPEG not found. Falling back to OpenCV JPEG encoding.")
 
 app = Flask(__name__)
 
 # Azure Blob Storage configuration
 connection_string = "DefaultEndpointsProtocol=https;AccountName=iotsavoooo;AccountKey=XKwdNyCuBmfUIM8PJmnL2eV1hrfuE9ayyGhFZwkW6O9d/b6OqhlisqPfLjvRX4+pcFemMmvI8+Gd+AStM5U66g==;EndpointSuffix=core.windows.net"  # Replace with your Azure storage connection string
 container_name = "video-uploads"  # Replace with your Azure Blob Storage container name
-blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+UPLOAD_MAX_CONCURRENCY = 8  # parallel block uploads per video
+
+# One keep-alive session for every upload so TLS connections are reused between recordings
+azure_session = requests.Session()
+azure_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=2 * UPLOAD_MAX_CONCURRENCY))
+blob_service_client = BlobServiceClient.from_connection_string(
+    connection_string, transport=RequestsTransport(session=azure_session, session_owner=False))
+container_client = blob_service_client.get_container_client(container_name)
+container_ready = False
+upload_executor = ThreadPoolExecutor(max_workers=2)
+
+# MJPEG stream encoding (raise the quality for archive-grade frames)
+JPEG_QUALITY = 75
+JPEG_PARAMS = [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY, int(cv2.IMWRITE_JPEG_OPTIMIZE), 0]
+FRAME_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+STREAM_FPS = 20  # frames encoded per second for each viewer; extra camera frames are skipped
 
 # Global variables
 video_stream = cv2.VideoCapture(0)
 output_frame = None
 lock = threading.Lock()
+frame_ready = threading.Condition(lock)  # notified by the capture thread on every new frame
+frame_count = 0
 recording = False
 paused = False
 video_writer = None
 video_filename = ""
+# Frames waiting for the MP4 writer thread, as (writer, frame, file_name) items.
+# A None frame closes that writer and starts its upload.
+RECORD_QUEUE_SIZE = 40
+record_queue = queue.Queue(maxsize=RECORD_QUEUE_SIZE)
+dropped_frames = 0  # frames of the current recording dropped because the writer fell behind
 
 def generate_frames():
-    global output_frame, lock, video_writer, recording, paused
+    global output_frame, frame_count, lock, video_writer, recording, paused, dropped_frames
 
     while True:
         success, frame = video_stream.read()
         if not success:
             break
 
-        with lock:
-            output_frame = frame.copy()
+        with frame_ready:
+            # read() hands back a freshly allocated array every time, so it can
+            # be published as-is without another full-frame copy
+            output_frame = frame
+            frame_count += 1
 
             if recording and not paused:
                 if video_writer is not None:
-                    video_writer.write(frame)
+                    try:
+                        record_queue.put_nowait((video_writer, frame, None))
+                    except queue.Full:
+                        # Counted rather than logged per frame; the total is logged when the recording stops
+                        dropped_frames += 1
+
+            frame_ready.notify_all()
 
         # Sleep for a short period to reduce CPU usage
         cv2.waitKey(1)
 
+def write_frames():
+    # Keep the mp4v encode and SD card writes off the capture thread
+    while True:
+        writer, frame, file_name = record_queue.get()
+        if frame is None:
+            try:
+                writer.release()
+            except Exception as e:
+                logger.error("Failed to close video file %s: %s", file_name, e)
+            # Hand the upload to the background executor (it also deletes the local file)
+            upload_executor.submit(upload_to_azure, file_name)
+        else:
+            try:
+                writer.write(frame)
+            except Exception as e:
+                logger.error("Failed to write video frame: %s", e)
+
+def encode_jpeg(frame):
+    # libjpeg-turbo uses NEON/SSE2 for colour conversion and DCT
+    if TURBOJPEG_AVAILABLE:
+        return turbo_jpeg.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR)
+    ret, buffer = cv2.imencode('.jpg', frame, JPEG_PARAMS)
+    return buffer.tobytes()
+
 def encode_frame():
-    global output_frame, lock
+    global output_frame, frame_count
+    last_count = 0
+    frame_interval = 1.0 / STREAM_FPS
+    next_time = time.monotonic()
 
     while True:
-        with lock:
-            if output_frame is None:
+        # Pace the encoder; the capture thread keeps draining the camera meanwhile
+        delay = next_time - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        # Sleep until the capture thread publishes a frame we have not sent yet,
+        # then encode outside the lock so capture never waits on the encoder
+        with frame_ready:
+            if not frame_ready.wait_for(lambda: frame_count != last_count, timeout=1.0):
                 continue
-            ret, buffer = cv2.imencode('.jpg', output_frame)
-            frame = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+            latest = output_frame
+            last_count = frame_count
+        frame = encode_jpeg(latest)
+
+        next_time += frame_interval
+        if time.monotonic() - next_time > 2 * frame_interval:
+            next_time = time.monotonic()  # fell behind, don't try to catch up with a burst
+        yield b''.join((FRAME_HEADER, frame, b'\r\n'))
 
 @app.route('/')
 def index():
@@ -61,7 +147,7 @@ def video_feed():
 
 @app.route('/control', methods=['POST'])
 def control():
-    global recording, paused, video_writer, video_filename
+    global recording, paused, video_writer, video_filename, dropped_frames
 
     action = request.form.get('action')
 
@@ -89,13 +175,17 @@ def control():
 
     elif action == 'stop':
         if recording:
-            recording = False
-            paused = False
-            if video_writer is not None:
-                video_writer.release()
-                video_writer = None
-            # Start upload in a separate thread
-            threading.Thread(target=upload_to_azure, args=(video_filename,)).start()
+            # Once recording is cleared under the lock no more frames get queued, so the
+            # close marker can be queued after releasing it without blocking capture
+            with lock:
+                recording = False
+                paused = False
+                writer, video_writer = video_writer, None
+                dropped, dropped_frames = dropped_frames, 0
+            if dropped:
+                logger.warning("Recording queue was full, dropped %d frames from %s", dropped, video_filename)
+            if writer is not None:
+                record_queue.put((writer, None, video_filename))
             return jsonify(status='Recording stopped and upload started')
         else:
             return jsonify(status='Not recording')
@@ -103,33 +193,47 @@ def control():
     else:
         return jsonify(status='Invalid action')
 
-def upload_to_azure(file_name):
-    blob_name = f"videos/{file_name}"
-    container_client = blob_service_client.get_container_client(container_name)
+def ensure_container():
+    """Create the upload container on first use; later uploads skip the round trip."""
+    global container_ready
+
+    if container_ready:
+        return True
 
     try:
         # Create the container if it does not exist
         container_client.create_container()
-        print(f"Container '{container_name}' created.")
+        logger.info("Container '%s' created.", container_name)
     except Exception as e:
         if "ContainerAlreadyExists" in str(e):
-            print(f"Container '{container_name}' already exists.")
+            logger.info("Container '%s' already exists.", container_name)
         else:
-            print(f"Failed to create or access container '{container_name}': {e}")
-            return
+            logger.error("Failed to create or access container '%s': %s", container_name, e)
+            return False
+
+    container_ready = True
+    return True
+
+def upload_to_azure(file_name):
+    blob_name = f"videos/{file_name}"
+
+    if not ensure_container():
+        return
 
     blob_client = container_client.get_blob_client(blob=blob_name)
 
     try:
         with open(file_name, "rb") as data:
-            blob_client.upload_blob(data, overwrite=True)
-        print(f"Successfully uploaded {file_name} to Azure Blob Storage as {blob_name}")
+            # Stream the file in blocks over several connections instead of one PUT
+            blob_client.upload_blob(data, overwrite=True, length=os.path.getsize(file_name),
+                                    max_concurrency=UPLOAD_MAX_CONCURRENCY)
+        logger.info("Successfully uploaded %s to Azure Blob Storage as %s", file_name, blob_name)
     except Exception as e:
-        print(f"Failed to upload {file_name} to Azure: {e}")
+        logger.error("Failed to upload %s to Azure: %s", file_name, e)
     finally:
         if os.path.exists(file_name):
             os.remove(file_name)
-            print(f"Local video file {file_name} deleted after upload.")
+            logger.info("Local video file %s deleted after upload.", file_name)
 
 def start_background_tasks():
     # Start the frame generation thread
@@ -137,6 +241,12 @@ def start_background_tasks():
     t.daemon = True
     t.start()
 
+    # Start the recording writer thread
+    w = threading.Thread(target=write_frames)
+    w.daemon = True
+    w.start()
+
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
     start_background_tasks()
     app.run(host='0.0.0.0', port=5001, threaded=True)
@@ -1,14 +1,48 @@
-import time
 import board
 import digitalio
 import adafruit_ssd1306
 from PIL import Image, ImageDraw, ImageFont
 from hx711 import HX711
 
+class SSD1306_I2C_Region(adafruit_ssd1306.SSD1306_I2C):
+    """SSD1306 driver that can push a range of display pages instead of the whole frame buffer"""
+
+    SET_COL_ADDR = 0x21
+    SET_PAGE_ADDR = 0x22
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # scratch buffer for region writes: I2C data control byte followed by the page data
+        self._region_buffer = bytearray(len(self.buffer))
+        self._region_buffer[0] = 0x40
+
+    def show_region(self, page_start, page_end):
+        """Send only pages page_start..page_end (8 pixel rows each, inclusive) to the display"""
+        page_start = max(0, page_start)
+        page_end = min(self.pages - 1, page_end)
+        start = 1 + page_start * self.width  # +1 skips the control byte at the start of self.buffer
+        length = (page_end - page_start + 1) * self.width
+        self._region_buffer[1:1 + length] = self.buffer[start:start + length]
+
+        self.write_cmd(self.SET_COL_ADDR)
+        self.write_cmd(0)
+        self.write_cmd(self.width - 1)
+        self.write_cmd(self.SET_PAGE_ADDR)
+        self.write_cmd(page_start)
+        self.write_cmd(page_end)
+        with self.i2c_device:
+            self.i2c_device.write(self._region_buffer, end=1 + length)
+
 # OLED setup
 RESET_PIN = digitalio.DigitalInOut(board.D4)
 i2c = board.I2C()
-oled = adafruit_ssd1306.SSD1306_I2C(128, 64, i2c, addr=0x3D, reset=RESET_PIN)
+oled = SSD1306_I2C_Region(128, 64, i2c, addr=0x3D, reset=RESET_PIN)
+
+# Frame buffer, drawing context and font are created once and reused for every update
+image = Image.new("1", (oled.width, oled.height))
+draw = ImageDraw.Draw(image)
+font = ImageFont.load_default()
+last_weight_str = None  # text currently on the screen
 
 # Load known reference values
 ZERO_VALUE = 8388608  # Use your obtained zero value here
@@ -27,13 +61,15 @@ def clear_display():
 
 # Function to update the display with the current weight
 def update_display(weight):
+    global last_weight_str
+    weight_str = f"Weight: {weight:.2f} g"
+    if weight_str == last_weight_str:
+        return  # nothing changed at display resolution, skip rendering and the I2C transfer
+    last_weight_str = weight_str
+
     width = oled.width
     height = oled.height
-    image = Image.new("1", (width, height))
-    draw = ImageDraw.Draw(image)
-
-    font = ImageFont.load_default()
-    weight_str = f"Weight: {weight:.2f} g"
+    draw.rectangle((0, 0, width, height), fill=0)  # clear the previous frame
 
     # Use textbbox to calculate text width and height
     bbox = draw.textbbox((0, 0), weight_str, font)
@@ -44,19 +80,23 @@ def update_display(weight):
     y_pos = (height - text_height) // 2
     draw.text((x_pos, y_pos), weight_str, font=font, fill=255)
 
+    # Only the pages covered by the text change between updates, so send just those
+    # (the rest of the screen stays blank from clear_display())
     oled.image(image)
-    oled.show()
+    oled.show_region((y_pos + bbox[1]) // 8, (y_pos + bbox[3] - 1) // 8)
+
+clear_display()
 
 # Main loop for reading and displaying the weight
 while True:
     try:
         # Get weight from the load cell
-        raw_value = hx.get_grams()  # Get the weight in grams
+        raw_value = hx.get_grams(median=True)  # Get the weight in grams (median filters out spiking reads)
         print(f"Weight: {raw_value:.2f} grams")  # Print the raw value (for debugging)
 
         # Update the OLED display
+        # No sleep needed: hx.get_grams() blocks until the HX711 has new samples
         update_display(raw_value)
-        time.sleep(1)  # Delay to update every second
 
     except (KeyboardInterrupt, SystemExit):
         print("Exiting...")
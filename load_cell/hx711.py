@@ -21,6 +21,7 @@ with this program; if not, write to the Free Software Foundation, Inc.,
 
 
 import RPi.GPIO as GPIO
+import numpy as np
 import time
 import sys
 
@@ -37,6 +38,9 @@ class HX711:
         self.GAIN = 0
         self.OFFSET = 0
         self.SCALE = 1
+        # Block on the DOUT edge while waiting for data; cleared if the GPIO
+        # backend can't do edge detection, falling back to polling
+        self.EDGE_WAIT = True
 
         # Setup the gpio pin numbering system
         GPIO.setmode(GPIO.BCM)
@@ -103,11 +107,19 @@ class HX711:
         :return reading from the HX711
         """
 
-        # Control if the chip is ready
+        # Control if the chip is ready. DOUT goes low when a conversion is
+        # ready, so sleep on that falling edge instead of spinning a core;
+        # the timeout re-checks the pin in case the edge came before the wait
         while not (GPIO.input(self.DOUT) == 0):
-            # Uncommenting the print below results in noisy output
-            # print("No input from HX711.")
-            pass
+            if self.EDGE_WAIT:
+                try:
+                    GPIO.wait_for_edge(self.DOUT, GPIO.FALLING, timeout=100)
+                    continue
+                except RuntimeError:
+                    # RPi.GPIO's sysfs edge detection fails on newer kernels
+                    # (rpi-lgpio works); poll the pin instead
+                    self.EDGE_WAIT = False
+            time.sleep(0.001)
 
         # Original C source code ported to Python as described in datasheet
         # https://cdn.sparkfun.com/datasheets/Sensors/ForceFlex/hx711_english.pdf
@@ -116,23 +128,30 @@ class HX711:
         # Lastly, behaviour matches while applying pressure
         # Please see page 8 of the PDF document
 
+        # Bind the GPIO calls and pin numbers to locals: each clock pulse is
+        # bit-banged from Python, so attribute lookups set the SCK rate
+        output = GPIO.output
+        input_ = GPIO.input
+        pd_sck = self.PD_SCK
+        dout = self.DOUT
+
         count = 0
 
         for i in range(24):
-            GPIO.output(self.PD_SCK, True)
+            output(pd_sck, True)
             count = count << 1
-            GPIO.output(self.PD_SCK, False)
-            if(GPIO.input(self.DOUT)):
+            output(pd_sck, False)
+            if(input_(dout)):
                 count += 1
 
-        GPIO.output(self.PD_SCK, True)
+        output(pd_sck, True)
         count = count ^ 0x800000
-        GPIO.output(self.PD_SCK, False)
+        output(pd_sck, False)
 
         # set channel and gain factor for next reading
         for i in range(self.GAIN):
-            GPIO.output(self.PD_SCK, True)
-            GPIO.output(self.PD_SCK, False)
+            output(pd_sck, True)
+            output(pd_sck, False)
 
         return count
 
@@ -146,14 +165,26 @@ class HX711:
             sum += self.read()
         return sum / times
 
-    def get_grams(self, times=16):
+    def read_median(self, times=16):
+        """
+        Median of `times` readings; robust against single spiking reads
+        :param times: measure x amount of time to get median
+        """
+        samples = np.empty(times, dtype=np.int64)
+        for i in range(times):
+            samples[i] = self.read()
+        return float(np.median(samples))
+
+    def get_grams(self, times=16, median=False):
         """
         :param times: Set value to calculate average, 
         be aware that high number of times will have a 
         slower runtime speed.        
+        :param median: use the median of the readings instead of the mean
         :return float weight in grams
         """
-        value = (self.read_average(times) - self.OFFSET)
+        reading = self.read_median(times) if median else self.read_average(times)
+        value = (reading - self.OFFSET)
         grams = (value / self.SCALE)
         return grams
 
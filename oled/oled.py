@@ -15,6 +15,14 @@ RESET_PIN = digitalio.DigitalInOut(board.D4)
 i2c = board.I2C()
 oled = adafruit_ssd1306.SSD1306_I2C(128, 64, i2c, addr=0x3D, reset=RESET_PIN)
 
+# Frame buffer, drawing context and fonts are created once and reused for every update
+image = Image.new("1", (oled.width, oled.height))
+draw = ImageDraw.Draw(image)
+font_size = 12
+font_size_ip = 19
+font_savonia = ImageFont.truetype(FONT_PATH, font_size)
+font_savonia_ip = ImageFont.truetype(FONT_PATH, font_size_ip)
+
 def clear_display():
     oled.fill(0)
     oled.show()
@@ -82,13 +90,7 @@ def draw_wifi_signal(draw, rssi, x, y):
 def update_display(interface, network_name, IP, rssi=None, show_cpu_temp=False):
     width = oled.width
     height = oled.height
-    image = Image.new("1", (width, height))
-    draw = ImageDraw.Draw(image)
-
-    font_size = 12
-    font_size_ip = 19
-    font_savonia = ImageFont.truetype(FONT_PATH, font_size)
-    font_savonia_ip = ImageFont.truetype(FONT_PATH, font_size_ip)
+    draw.rectangle((0, 0, width, height), fill=0)  # clear the previous frame
 
     if show_cpu_temp:
         cpu_temp = get_cpu_temperature()
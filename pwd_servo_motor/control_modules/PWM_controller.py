@@ -31,10 +31,16 @@ Usage:
 #TODO: well not that todo but currently we're controlling motors with angle values, so deprecate the "type" parameter (this goes with the PCA9685 library)
 
 
+import logging
 import threading
 import yaml # PyYAML
 import time
 
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml C parser
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 try:
     from adafruit_servokit import ServoKit
     SERVOKIT_AVAILABLE = True
@@ -42,6 +48,8 @@ except ImportError:
     SERVOKIT_AVAILABLE = False
     print("PWM module not found. Running in simulation mode.")
 
+logger = logging.getLogger(__name__)
+
 
 class PWM_hat:
     def __init__(self, config_file: str, simulation_mode: bool = False, pump_variable: bool = True,
@@ -50,9 +58,7 @@ class PWM_hat:
 
         self.simulation_mode = simulation_mode
 
-        with open(config_file, 'r') as file:
-            configs = yaml.safe_load(file)
-            self.channel_configs = configs['CHANNEL_CONFIGS']
+        self.channel_configs = self.load_config(config_file)
 
         self.pump_variable = pump_variable
         self.tracks_disabled = tracks_disabled
@@ -66,6 +72,7 @@ class PWM_hat:
         self.input_rate_threshold = input_rate_threshold
         self.skip_rate_checking = (input_rate_threshold == 0)
         self.is_safe_state = not self.skip_rate_checking
+        self.safe_state_logged = False  # ignored input is reported once per safe-state period
 
         self.input_event = threading.Event()
         self.monitor_thread = None
@@ -73,7 +80,7 @@ class PWM_hat:
 
         self.is_safe_state = True
         self.input_count = 0
-        self.last_input_time = time.time()
+        self.last_input_time = time.monotonic()
         self.input_timestamps = []
 
         self.center_val_servo = 90
@@ -96,6 +103,7 @@ class PWM_hat:
 
         self.validate_configuration()
         self.defined_channel_types = self.get_defined_channel_types()
+        self.angle_channels = self.build_angle_channels()
 
         # set servo angles to None at start
         self.servo_angles = {f"{channel_name} angle": None
@@ -107,6 +115,13 @@ class PWM_hat:
         if not self.skip_rate_checking:    # Start monitoring if threshold is set
             self.start_monitoring()
 
+    @staticmethod
+    def load_config(config_file: str) -> dict:
+        """Load the channel configurations from the YAML file."""
+        with open(config_file, 'r') as file:
+            configs = yaml.load(file, Loader=YamlLoader)
+        return configs['CHANNEL_CONFIGS']
+
     def calculate_num_inputs(self) -> int:
         """Calculate the number of input channels specified in the configuration."""
         input_channels = set()
@@ -208,7 +223,7 @@ class PWM_hat:
         while self.running:
             if self.input_event.wait(timeout=1.0 / self.input_rate_threshold):
                 self.input_event.clear()
-                current_time = time.time()
+                current_time = time.monotonic()
                 time_diff = current_time - self.last_input_time
                 self.last_input_time = current_time
 
@@ -246,15 +261,19 @@ class PWM_hat:
             self.input_event.set()
 
         if debug:
-            print(f"Debug: update_values called with raw_values: {raw_values}")
-            print(f"Debug: Current safe state: {self.is_safe_state}")
-            print(f"Debug: skip_rate_checking: {self.skip_rate_checking}")
+            logger.info("update_values called with raw_values: %s", raw_values)
+            logger.info("Current safe state: %s", self.is_safe_state)
+            logger.info("skip_rate_checking: %s", self.skip_rate_checking)
 
 
 
         if not self.skip_rate_checking and not self.is_safe_state:
-            print(f"System in safe state. Ignoring input. Average rate: {self.get_average_input_rate():.2f}Hz")
+            if not self.safe_state_logged:
+                logger.warning("System in safe state. Ignoring input until the rate recovers. Average rate: %.2fHz",
+                               self.get_average_input_rate())
+                self.safe_state_logged = True
             return
+        self.safe_state_logged = False
 
         if raw_values is None:
             self.reset()
@@ -304,14 +323,14 @@ class PWM_hat:
         input_channel = pump_config.get('input_channel')
 
         if debug:
-            print(f"Debug: input_channel = {input_channel}, type = {type(input_channel)}")
-            print(f"Debug: pump_variable = {self.pump_variable}")
-            print(f"Debug: pump_variable_sum = {self.pump_variable_sum}")
-            print(f"Debug: manual_pump_load = {self.manual_pump_load}")
+            logger.info("input_channel = %s, type = %s", input_channel, type(input_channel))
+            logger.info("pump_variable = %s", self.pump_variable)
+            logger.info("pump_variable_sum = %s", self.pump_variable_sum)
+            logger.info("manual_pump_load = %s", self.manual_pump_load)
 
         if not self.pump_enabled:
             throttle_value = -1.0  # Set to -1 when pump is disabled
-            print("Debug: Pump is disabled")
+            logger.debug("Pump is disabled")
         elif input_channel is None or input_channel == 'None':
             # No direct input channel, use variable pump sum if enabled
             #print("Debug: No direct input channel")
@@ -329,7 +348,7 @@ class PWM_hat:
             throttle_value = values[input_channel]
             # print(f"Debug: Using direct input channel {input_channel}. Throttle: {throttle_value}")
         else:
-            print(f"Warning: Invalid input channel {input_channel}. Using pump_idle.")
+            logger.warning("Invalid input channel %s. Using pump_idle.", input_channel)
             throttle_value = pump_idle
 
         throttle_value = max(-1.0, min(1.0, throttle_value))
@@ -339,38 +358,48 @@ class PWM_hat:
 
         return throttle_value  # Return the final throttle value for debugging
 
-    def handle_angles(self, values):
+    def build_angle_channels(self) -> list:
+        """
+        Precompute the per-channel constants used by handle_angles().
+
+        The servo center, gamma and direction-signed multipliers only change with the configuration,
+        so they are resolved once here instead of being looked up in the config dicts on every update.
+        """
+        angle_channels = []
         for channel_name, config in self.channel_configs.items():
             if config['type'] == 'angle':
-                if self.tracks_disabled and channel_name in ['trackL', 'trackR']:
-                    continue
-
-                output_channel = config['output_channel']
-
-                if output_channel >= len(values):
-                    print(f"Channel '{channel_name}': No data available.")
-                    continue
+                angle_channels.append((
+                    channel_name,
+                    f"{channel_name} angle",
+                    config['output_channel'],
+                    self.center_val_servo + config['offset'],
+                    config.get('gamma_positive', 1),
+                    config.get('multiplier_positive', 1) * config['direction'],
+                    config.get('gamma_negative', 1),
+                    config.get('multiplier_negative', 1) * config['direction'],
+                ))
+        return angle_channels
 
-                input_value = values[output_channel]
-                center = self.center_val_servo + config['offset']
+    def handle_angles(self, values):
+        for (channel_name, angle_key, output_channel, center,
+             gamma_positive, gain_positive, gamma_negative, gain_negative) in self.angle_channels:
+            if self.tracks_disabled and channel_name in ('trackL', 'trackR'):
+                continue
 
-                if input_value >= 0:
-                    gamma = config.get('gamma_positive', 1)
-                    multiplier = config.get('multiplier_positive', 1)
-                    normalized_input = input_value
-                else:
-                    gamma = config.get('gamma_negative', 1)
-                    multiplier = config.get('multiplier_negative', 1)
-                    normalized_input = -input_value
+            if output_channel >= len(values):
+                logger.warning("Channel '%s': No data available.", channel_name)
+                continue
 
-                adjusted_input = normalized_input ** gamma
-                gamma_corrected_value = adjusted_input if input_value >= 0 else -adjusted_input
+            input_value = values[output_channel]
 
-                angle = center + (gamma_corrected_value * multiplier * config['direction'])
-                angle = max(0, min(180, angle))
+            if input_value >= 0:
+                angle = center + (input_value ** gamma_positive) * gain_positive
+            else:
+                angle = center - ((-input_value) ** gamma_negative) * gain_negative
+            angle = max(0, min(180, angle))
 
-                self.kit.servo[config['output_channel']].angle = angle
-                self.servo_angles[f"{channel_name} angle"] = round(angle, 1)
+            self.kit.servo[output_channel].angle = angle
+            self.servo_angles[angle_key] = round(angle, 1)
 
     def reset(self, reset_pump=True, pump_reset_point=-1.0):
         """
@@ -438,16 +467,14 @@ class PWM_hat:
         self.reset()
 
         # Re-read the config file
-        with open(config_file, 'r') as file:
-            configs = yaml.safe_load(file)
-            self.channel_configs = configs['CHANNEL_CONFIGS']
+        self.channel_configs = self.load_config(config_file)
 
         # Validate the new configuration
         self.validate_configuration()
+        self.angle_channels = self.build_angle_channels()
 
-        # Reinitialize necessary components
-        if SERVOKIT_AVAILABLE and not self.simulation_mode:
-            self.kit = ServoKit(channels=self.num_outputs)
+        # Keep the existing ServoKit: the channel count is fixed, and a new instance would
+        # open another I2C bus handle and re-initialize the PCA9685 under running servos
 
         # Restart monitoring if it was running
         if self.running:
@@ -488,7 +515,7 @@ class PWM_hat:
 
         :return: Average input rate in Hz, or 0 if no inputs in the last 30 seconds.
         """
-        current_time = time.time()
+        current_time = time.monotonic()
 
         # Filter timestamps to last 30 seconds
         recent_timestamps = [t for t in self.input_timestamps if current_time - t <= 30]
@@ -516,9 +543,9 @@ class PWM_hat:
         current_throttle = self.handle_pump(self.values)
 
         if debug:
-            print(f"Current pump throttle: {current_throttle:.2f}")
-            print(f"Current manual pump load: {self.manual_pump_load:.2f}")
-            print(f"Current pump variable sum: {self.pump_variable_sum:.2f}")
+            logger.info("Current pump throttle: %.2f", current_throttle)
+            logger.info("Current manual pump load: %.2f", self.manual_pump_load)
+            logger.info("Current pump variable sum: %.2f", self.pump_variable_sum)
 
     def reset_pump_load(self, debug=False):
         """
@@ -532,7 +559,7 @@ class PWM_hat:
         current_throttle = self.handle_pump(self.values)
 
         if debug:
-            print(f"Pump load reset. Current pump throttle: {current_throttle:.2f}")
+            logger.info("Pump load reset. Current pump throttle: %.2f", current_throttle)
 
 class ServoKitStub:
     def __init__(self, channels):
@@ -551,7 +578,7 @@ class ServoStub:
     @angle.setter
     def angle(self, value):
         self._angle = max(0, min(180, value))
-        print(f"[SIMULATION] Servo angle set to: {self._angle} degrees")
+        logger.debug("[SIMULATION] Servo angle set to: %s degrees", self._angle)
 
 class ContinuousServoStub:
     def __init__(self):
@@ -564,4 +591,4 @@ class ContinuousServoStub:
     @throttle.setter
     def throttle(self, value):
         self._throttle = max(-1, min(1, value))
-        print(f"[SIMULATION] Continuous servo throttle set to: {self._throttle}")
+        logger.debug("[SIMULATION] Continuous servo throttle set to: %s", self._throttle)
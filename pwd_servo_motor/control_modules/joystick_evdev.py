@@ -1,9 +1,10 @@
-import math
+import logging
 import threading
-import time
 import evdev
 from evdev import InputDevice, categorize, ecodes
 
+logger = logging.getLogger(__name__)
+
 
 class XboxController:
     """
@@ -24,13 +25,56 @@ class XboxController:
     STICK_CENTER = STICK_MAX // 2  # Center position
     TRIGGER_MAX = 1024  # Maximum value for triggers
     CENTER_TOLERANCE = 350  # Dead zone size around center position
+    STICK_SCALE = 2.0 / STICK_MAX  # precomputed reciprocals: multiply per event instead of divide
+    STICK_DEADZONE = CENTER_TOLERANCE * STICK_SCALE
+    TRIGGER_SCALE = 1.0 / TRIGGER_MAX
     MAX_RECONNECT_ATTEMPTS = 5
 
+    # Controller state in the order returned by read()
+    DEFAULT_STATE = {
+        'LeftJoystickY': 0,     # Joysticks (-1 to 1)
+        'LeftJoystickX': 0,
+        'RightJoystickY': 0,
+        'RightJoystickX': 0,
+        'LeftTrigger': 0,       # Triggers (0 to 1)
+        'RightTrigger': 0,
+        'LeftBumper': 0,        # Buttons (0 or 1)
+        'RightBumper': 0,
+        'A': 0,
+        'X': 0,
+        'Y': 0,
+        'B': 0,
+        'LeftThumb': 0,
+        'RightThumb': 0,
+        'Back': 0,
+        'Start': 0,
+        'DPadY': 0,             # D-pad: -1 up, +1 down
+        'DPadX': 0              # D-pad: -1 left, +1 right
+    }
+
+    STATE_KEYS = tuple(DEFAULT_STATE)  # index of each value in read_array()
+
+    # Button event code -> state key (one dict lookup per event instead of an elif ladder)
+    BUTTON_MAP = {
+        ecodes.BTN_SOUTH: 'A',
+        ecodes.BTN_NORTH: 'X',  # flipped
+        ecodes.BTN_WEST: 'Y',   # flipped
+        ecodes.BTN_EAST: 'B',
+        ecodes.BTN_TL: 'LeftBumper',
+        ecodes.BTN_TR: 'RightBumper',
+        ecodes.BTN_THUMBL: 'LeftThumb',
+        ecodes.BTN_THUMBR: 'RightThumb',
+        ecodes.BTN_SELECT: 'Back',
+        ecodes.BTN_START: 'Start'
+    }
+    STICK_AXES = frozenset(('LeftJoystickX', 'LeftJoystickY', 'RightJoystickX', 'RightJoystickY'))
+    TRIGGER_AXES = frozenset(('LeftTrigger', 'RightTrigger'))
+
     def __init__(self):
         """Initialize the controller interface."""
         self._monitor_thread = None
         self._stop_event = threading.Event()
-        self._connected = False
+        self._connected = threading.Event()  # an Event so callers can block until a controller shows up
         self._reconnect_count = 0
         self._device = None
 
@@ -54,41 +98,20 @@ class XboxController:
 
     def reset_values(self):
         """Reset all controller values to their defaults."""
-        # Joysticks (-1 to 1)
-        self.LeftJoystickY = 0
-        self.LeftJoystickX = 0
-        self.RightJoystickY = 0
-        self.RightJoystickX = 0
-
-        # Triggers (0 to 1)
-        self.LeftTrigger = 0
-        self.RightTrigger = 0
-
-        # Buttons (0 or 1)
-        self.LeftBumper = 0
-        self.RightBumper = 0
-        self.A = 0
-        self.X = 0
-        self.Y = 0
-        self.B = 0
-        self.LeftThumb = 0
-        self.RightThumb = 0
-        self.Back = 0
-        self.Start = 0
-
-        # D-pad (-1, 0, or 1 for each axis)
-        self.DPadX = 0  # -1 left, +1 right
-        self.DPadY = 0  # -1 up, +1 down
+        # Swap in a fresh dict so a concurrent read() never sees a half-reset state
+        self._state = dict(self.DEFAULT_STATE)
 
     def _find_controller(self):
         """
         Find and return the first available Xbox controller.
         Returns None if no controller is found.
         """
-        devices = [evdev.InputDevice(path) for path in evdev.list_devices()]
-        for device in devices:
+        for path in evdev.list_devices():
+            device = evdev.InputDevice(path)
             if "xbox" in device.name.lower():
                 return device
+            # Close non-matching devices so repeated scans don't leak file descriptors
+            device.close()
         return None
 
     def start_monitoring(self):
@@ -107,36 +130,16 @@ class XboxController:
 
     def _process_event(self, event):
         if event.type == ecodes.EV_KEY:
-            # Button handling remains unchanged
-            value = 1 if event.value else 0
-
-            if event.code == ecodes.BTN_SOUTH:
-                self.A = value
-            elif event.code == ecodes.BTN_NORTH:
-                self.Y = value
-            elif event.code == ecodes.BTN_WEST:
-                self.X = value
-            elif event.code == ecodes.BTN_EAST:
-                self.B = value
-            elif event.code == ecodes.BTN_TL:
-                self.LeftBumper = value
-            elif event.code == ecodes.BTN_TR:
-                self.RightBumper = value
-            elif event.code == ecodes.BTN_THUMBL:
-                self.LeftThumb = value
-            elif event.code == ecodes.BTN_THUMBR:
-                self.RightThumb = value
-            elif event.code == ecodes.BTN_SELECT:
-                self.Back = value
-            elif event.code == ecodes.BTN_START:
-                self.Start = value
+            button_name = self.BUTTON_MAP.get(event.code)
+            if button_name:
+                self._state[button_name] = 1 if event.value else 0
 
         elif event.type == ecodes.EV_ABS:
             axis_name = self.axis_map.get(event.code)
             if not axis_name:
                 return
 
-            if axis_name in ['LeftJoystickX', 'LeftJoystickY', 'RightJoystickX', 'RightJoystickY']:
+            if axis_name in self.STICK_AXES:
                 # Print raw value first
                 #print(f"Raw value: {event.value}")
 
@@ -145,26 +148,26 @@ class XboxController:
                 # 0 -> -1
                 # STICK_MAX/2 -> 0
                 # STICK_MAX -> 1
-                normalized_value = (event.value / (self.STICK_MAX / 2)) - 1.0
+                normalized_value = event.value * self.STICK_SCALE - 1.0
 
                 # Print pre-deadzone value
                 #print(f"Pre-deadzone: {normalized_value}")
 
                 # Apply deadzone
-                if abs(normalized_value) < (self.CENTER_TOLERANCE / (self.STICK_MAX / 2)):
+                if abs(normalized_value) < self.STICK_DEADZONE:
                     normalized_value = 0
 
                 # Print final value
                 #print(f"Final value: {normalized_value}\n")
 
-                setattr(self, axis_name, normalized_value)
+                self._state[axis_name] = normalized_value
 
-            elif axis_name in ['LeftTrigger', 'RightTrigger']:
-                normalized_value = event.value / self.TRIGGER_MAX
-                setattr(self, axis_name, normalized_value)
+            elif axis_name in self.TRIGGER_AXES:
+                normalized_value = event.value * self.TRIGGER_SCALE
+                self._state[axis_name] = normalized_value
 
             elif axis_name in ['DPadX', 'DPadY']:
-                setattr(self, axis_name, event.value)
+                self._state[axis_name] = event.value
 
     def _monitor_controller(self):
         """Monitor controller events and handle disconnections."""
@@ -175,7 +178,7 @@ class XboxController:
                     if not self._device:
                         raise OSError("Controller not found")
 
-                self._connected = True
+                self._connected.set()
                 self._reconnect_count = 0
 
                 for event in self._device.read_loop():
@@ -185,12 +188,15 @@ class XboxController:
                         break
 
             except (OSError, IOError):
-                if self._connected:
-                    print("[JOYSTICK] Controller disconnected. Attempting to reconnect...")
-                    self._connected = False
+                if self._connected.is_set():
+                    logger.warning("[JOYSTICK] Controller disconnected. Attempting to reconnect...")
+                    self._connected.clear()
                     self.reset_values()
+                if self._device:
+                    self._device.close()
+                    self._device = None
                 if not self._attempt_reconnect():
-                    print("[ERROR] Maximum reconnection attempts reached.")
+                    logger.error("[JOYSTICK] Maximum reconnection attempts reached.")
                     self._stop_event.set()
                     break
 
@@ -201,18 +207,19 @@ class XboxController:
             try:
                 self._device = self._find_controller()
                 if self._device:
-                    print("[JOYSTICK] Controller reconnected successfully!")
-                    self._connected = True
+                    logger.info("[JOYSTICK] Controller reconnected successfully!")
+                    self._connected.set()
                     return True
             except OSError:
                 pass
 
             self._reconnect_count += 1
             remaining = self.MAX_RECONNECT_ATTEMPTS - self._reconnect_count
-            print(f"[JOYSTICK] Reconnection attempt {self._reconnect_count}/{self.MAX_RECONNECT_ATTEMPTS} "
-                  f"failed. {remaining} attempts remaining. "
-                  f"Retrying in {wait_delay} seconds...")
-            time.sleep(wait_delay)
+            logger.info("[JOYSTICK] Reconnection attempt %d/%d failed. %d attempts remaining. "
+                        "Retrying in %d seconds...",
+                        self._reconnect_count, self.MAX_RECONNECT_ATTEMPTS, remaining, wait_delay)
+            # Wait on the stop event rather than sleeping so stop_monitoring() returns immediately
+            self._stop_event.wait(wait_delay)
         return False
 
     def read(self):
@@ -220,34 +227,38 @@ class XboxController:
         Read the current state of all controller inputs.
         Returns a dictionary containing all controller values.
         """
-        if not self._connected:
-            print("[Warning] Controller not connected! (press any button to connect)")
+        if not self._connected.is_set():
+            logger.warning("[JOYSTICK] Controller not connected! (press any button to connect)")
             self.reset_values()
 
-        return {
-            'LeftJoystickY': self.LeftJoystickY,
-            'LeftJoystickX': self.LeftJoystickX,
-            'RightJoystickY': self.RightJoystickY,
-            'RightJoystickX': self.RightJoystickX,
-            'LeftTrigger': self.LeftTrigger,
-            'RightTrigger': self.RightTrigger,
-            'LeftBumper': self.LeftBumper,
-            'RightBumper': self.RightBumper,
-            'A': self.A,
-            'X': self.Y, # flipped
-            'Y': self.X, # flipped
-            'B': self.B,
-            'LeftThumb': self.LeftThumb,
-            'RightThumb': self.RightThumb,
-            'Back': self.Back,
-            'Start': self.Start,
-            'DPadY': self.DPadY,    # these need to be flipped for some reason
-            'DPadX': self.DPadX     # these need to be flipped for some reason
-        }
+        # Shallow copy so callers may modify the result (main.py flips the triggers)
+        return dict(self._state)
+
+    def read_array(self):
+        """
+        Read the current state of all controller inputs as a float32 vector.
+        Values are ordered as in STATE_KEYS, so consumers can do vectorized
+        math on them or forward the raw bytes without per-field serialization.
+        Requires numpy, which is imported here so read() and main.py don't depend on it.
+        """
+        import numpy as np
+
+        if not self._connected.is_set():
+            logger.warning("[JOYSTICK] Controller not connected! (press any button to connect)")
+            self.reset_values()
+
+        return np.fromiter(self._state.values(), dtype=np.float32, count=len(self.STATE_KEYS))
 
     def is_connected(self):
         """Check if the controller is currently connected."""
-        return self._connected
+        return self._connected.is_set()
+
+    def wait_for_connection(self, timeout=None):
+        """
+        Block until the controller is connected or the timeout (seconds) expires.
+        Returns True if the controller is connected.
+        """
+        return self._connected.wait(timeout)
 
     def __del__(self):
         """Cleanup when the object is deleted."""
@@ -1,23 +1,35 @@
 
+import logging
 # import PWM (servo controller)
 import control_modules.PWM_controller as PWM_controller
 # import joystick module (evdev-version)
 import control_modules.joystick_evdev as joystick_module
 #import time for sleep
-from time import sleep
+from time import sleep, monotonic_ns
+
+logger = logging.getLogger(__name__)
+
+LOOP_INTERVAL_NS = 10_000_000  # control loop period in nanoseconds (100Hz)
 
 
 def main(pwm, controller):
     step = 0
+    # previous A/B states, so the track toggles fire once per press instead of every tick
+    prev_a = prev_b = 0
 
     pwm.print_input_mappings()
     sleep(5)
 
+    next_tick = monotonic_ns()
     while True:
 
         if not controller.is_connected():
-            # controller not connected, do nothing
-            pass
+            # controller not connected, block until it is instead of polling every tick
+            controller.wait_for_connection(timeout=1.0)
+            # forget held buttons, so the first press after reconnecting is not missed
+            prev_a = prev_b = 0
+            next_tick = monotonic_ns()
+            continue
         else:
             # read all the joystick values
             joy_values = controller.read()
@@ -35,15 +47,17 @@ def main(pwm, controller):
                 joy_values['RightTrigger'] = -joy_values['RightTrigger']
                 
                 
-            if joy_values['A']:
+            if joy_values['A'] and not prev_a:
                 # example, replace with your own logic
                 # enable tracks with A button
                 pwm.set_tracks(True)
                 
-            if joy_values['B']:
+            if joy_values['B'] and not prev_b:
                 # example, replace with your own logic
                 # disable tracks with B button
                 pwm.set_tracks(False)
+
+            prev_a, prev_b = joy_values['A'], joy_values['B']
                 
                 
             # example, increa pump stock speed
@@ -64,21 +78,31 @@ def main(pwm, controller):
             ]
 
             #print(f"giving input: {joy_values['LeftJoystickX']}")
-            print(controller_list)
+            logger.debug("controller values: %s", controller_list)
             # update the servo controller with the new values
             pwm.update_values(controller_list)
 
             # print every 20 steps
             if step % 20 == 0:
                 rate = pwm.get_average_input_rate()
-                print(f"average input rate: {rate}")
+                logger.info("average input rate: %.2f", rate)
                 step = 0
 
         step += 1
-        sleep(0.01) # rough estimate of the loop time (100Hz)
+
+        # sleep until the next absolute deadline, so the time spent in the loop body doesn't stretch the period
+        # (integer nanoseconds, and a single clock read per iteration)
+        next_tick += LOOP_INTERVAL_NS
+        now = monotonic_ns()
+        if next_tick > now:
+            sleep((next_tick - now) / 1e9)
+        else:
+            # overran the deadline: skip the missed ticks instead of bursting to catch up
+            next_tick = now
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
 
     # initialize the servo controller
     # you don't need to give all those arguments, but you can if you want to change the default values